@@ -1,24 +1,89 @@
-from enum import Enum
+from itertools import chain
+from math import prod
+from operator import index
 from struct import Struct
 
 
+_TYPECODE_SIZE = {
+    'b': 1, 'B': 1, 'h': 2, 'H': 2, 'i': 4, 'I': 4, 'q': 8, 'Q': 8,
+    '?': 1, 'x': 1, 's': 1, 'e': 2, 'f': 4, 'd': 8
+}
+
+
+_TYPECODE_NAME = {
+    'b': 'unsigned byte', 'B': 'signed byte',
+    'h': 'unsigned 2-bytes', 'H': 'signed 2-bytes',
+    'i': 'unsigned 4-bytes', 'I': 'signed 4-bytes',
+    'q': 'unsigned 8-bytes', 'Q': 'signed 8-bytes',
+    '?': 'bool', 'x': '<ignored>', 's': 'text',
+    'e': 'half-float', 'f': 'float', 'd': 'double'
+}
+
+
+# Endian markers, in the order used for indexing the tables below.
+_ENDIANS = ('|', '<', '>')
+
+
+# The result of combining two endians (by index), or None for a conflict.
+_ENDIAN_MERGE = (
+    (0, 1, 2),
+    (1, 1, None),
+    (2, None, 2)
+)
+
+
+def _array_count(count):
+    # The count as a plain int, or None if it isn't integer-like.
+    try:
+        count = index(count)
+    except TypeError:
+        return None
+    if count < 0:
+        raise ValueError('array count must be non-negative')
+    return count
+
+
+# Cache of interned unshaped Atom instances, keyed by typecode.
+_ATOMS = {}
+
+
 class _ArrayElement:
-    def __init__(self, shape=()):
+    __slots__ = (
+        '_shape', '_element_size', '_size', '_shapestr', '__weakref__'
+    )
+
+
+    def __init__(self, element_size, shape=()):
+        # Everything is immutable, so derived values are computed up front.
         self._shape = shape
+        self._element_size = element_size
+        self._size = element_size * prod(shape)
+        self._shapestr = ''.join(f'[{s}]' for s in shape)
 
 
     def __add__(self, other):
-        x = self._normalize()
-        y = other._normalize()
-        return x.__class__(x.parts + y.parts, x.names + y.names)
+        # Unshaped Components (the common case when chaining) are already
+        # normalized, so the method calls are skipped for them.
+        x = self
+        if x._shape != () or not isinstance(x, Components):
+            x = x._normalize()
+        y = other
+        if y._shape != () or not isinstance(y, Components):
+            y = y._normalize()
+        return Components(
+            x._parts + y._parts, x._names + y._names,
+            element_size=x._size + y._size
+        )
+
+
+    @property
+    def element_size(self):
+        return self._element_size
 
 
     @property
     def size(self):
-        result = self.element_size
-        for dimension in self.shape:
-            result *= dimension
-        return result
+        return self._size
 
 
     @property
@@ -28,13 +93,20 @@ class _ArrayElement:
 
     @property
     def shapestr(self):
-        return ''.join(f'[{s}]' for s in self.shape)
+        return self._shapestr
 
 
 class Components(_ArrayElement):
+    __slots__ = ('_parts', '_names', '_str_cache', '_normalized')
+
+
     # "parts" are either other Components, or Atoms.
-    def __init__(self, parts, names=None, shape=()):
-        super().__init__(shape)
+    # Internal callers that already know the total size of the parts pass it
+    # as `element_size`, to avoid re-summing them on every `+`.
+    def __init__(self, parts, names=None, shape=(), *, element_size=None):
+        if element_size is None:
+            element_size = sum(p._size for p in parts)
+        super().__init__(element_size, shape)
         self._parts = parts
         if names is None:
             self._names = (None,) * len(parts)
@@ -42,29 +114,48 @@ class Components(_ArrayElement):
             raise ValueError('name count must match field count')
         else:
             self._names = tuple(names)
+        self._str_cache = None
+        self._normalized = None
 
 
     def _normalize(self):
-        return self if self._shape == () else Components((self,))
+        if self._shape == ():
+            return self
+        if self._normalized is None:
+            self._normalized = Components(
+                (self,), element_size=self._size
+            )
+        return self._normalized
+
+
+    @staticmethod
+    def join(elements):
+        # Equivalent to chaining `+`, but concatenates everything at once.
+        normalized = [e._normalize() for e in elements]
+        return Components(
+            tuple(chain.from_iterable(n._parts for n in normalized)),
+            tuple(chain.from_iterable(n._names for n in normalized)),
+            element_size=sum(n._size for n in normalized)
+        )
 
 
     def group(self, name=None):
-        return Components((self,), (name,))
+        return Components((self,), (name,), element_size=self._size)
 
 
     def named(self, name):
-        if len(self.parts) != 1:
+        if len(self._parts) != 1:
             raise ValueError("can't apply single name to multiple fields")
-        return Components(self.parts, (name,), self._shape)
+        return Components(
+            self._parts, (name,), self._shape,
+            element_size=self._element_size
+        )
 
 
     def with_names(self, names):
-        return Components(self.parts, names, self._shape)
-
-
-    @property
-    def element_size(self):
-        return sum(p.size for p in self.parts)
+        return Components(
+            self._parts, names, self._shape, element_size=self._element_size
+        )
 
 
     @property
@@ -78,20 +169,25 @@ class Components(_ArrayElement):
 
 
     def __mul__(self, count):
-        return Components(self.parts, self.names, self.shape + (count,))
+        count = _array_count(count)
+        if count is None:
+            return NotImplemented
+        return Components(
+            self._parts, self._names, self._shape + (count,),
+            element_size=self._element_size
+        )
 
 
     def _fields(self, amount, include_shapestr=True):
         if include_shapestr:
-            yield self.shapestr
-        inames = [
+            yield self._shapestr
+        labels = [
             str(i) if name is None else name
-            for i, name in enumerate(self.names)
+            for i, name in enumerate(self._names)
         ]
-        width = max(len(name) for name in inames)
-        for name, part in zip(inames, self.parts):
-            name = str(i) if name is None else name
-            yield f'{name:{width}}: {part._indented(amount + width + 2)}'
+        width = max(len(label) for label in labels)
+        for label, part in zip(labels, self._parts):
+            yield f'{label:{width}}: {part._indented(amount + width + 2)}'
 
 
     def _indented(self, amount, include_shapestr=True):
@@ -100,25 +196,56 @@ class Components(_ArrayElement):
 
 
     def __str__(self):
-        return self._indented(0)
+        if self._str_cache is None:
+            self._str_cache = self._indented(0)
+        return self._str_cache
 
 
 class Atom(_ArrayElement):
+    __slots__ = ('_typecode', '_str_cache', '_normalized')
+
+
+    def __new__(cls, typecode, shape=()):
+        # Atoms are immutable, so each unshaped one is only created once.
+        # Shaped Atoms are not interned, since there is no bound on them.
+        atom = _ATOMS.get(typecode) if shape == () else None
+        if atom is None:
+            atom = super().__new__(cls)
+            atom._init(typecode, shape)
+            if shape == ():
+                _ATOMS[typecode] = atom
+        return atom
+
+
     def __init__(self, typecode, shape=()):
-        super().__init__(shape)
-        self._typecode = typecode
+        pass # already initialized by __new__.
 
 
-    def _normalize(self):
-        return Components((self,))
+    def __reduce__(self):
+        # Unpickling goes back through __new__, and thus the intern table.
+        # No state is included, so shared instances are never overwritten.
+        return (Atom, (self._typecode, self._shape))
 
 
-    @property
-    def element_size(self):
-        return {
-            'b': 1, 'B': 1, 'h': 2, 'H': 2, 'i': 4, 'I': 4, 'q': 8, 'Q': 8,
-            '?': 1, 'x': 1, 's': 1, 'e': 2, 'f': 4, 'd': 8
-        }[self._typecode]
+    def __copy__(self):
+        return self
+
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+    def _init(self, typecode, shape):
+        super().__init__(_TYPECODE_SIZE[typecode], shape)
+        self._typecode = typecode
+        self._str_cache = None
+        self._normalized = None
+
+
+    def _normalize(self):
+        if self._normalized is None:
+            self._normalized = Components((self,), element_size=self._size)
+        return self._normalized
 
 
     def _indented(self, _):
@@ -126,38 +253,49 @@ class Atom(_ArrayElement):
 
 
     def __str__(self):
-        typename = {
-            'b': 'unsigned byte', 'B': 'signed byte',
-            'h': 'unsigned 2-bytes', 'H': 'signed 2-bytes',
-            'i': 'unsigned 4-bytes', 'I': 'signed 4-bytes',
-            'q': 'unsigned 8-bytes', 'Q': 'signed 8-bytes',
-            '?': 'bool', 'x': '<ignored>', 's': 'text',
-            'e': 'half-float', 'f': 'float', 'd': 'double'
-        }[self._typecode]
-        return f'{typename}{self.shapestr}'
+        if self._str_cache is None:
+            name = _TYPECODE_NAME[self._typecode]
+            self._str_cache = f'{name}{self._shapestr}'
+        return self._str_cache
 
 
-    def __mul__(self, other):
-        return Atom(self._typecode, self.shape + (other,))
+    def __mul__(self, count):
+        count = _array_count(count)
+        if count is None:
+            return NotImplemented
+        return Atom(self._typecode, self._shape + (count,))
 
 
 class Structure:
+    __slots__ = (
+        '_offset', '_padding', '_data_size', '_size', '_components',
+        '_endian_i', '_str_cache', '__weakref__'
+    )
+
+
     def __init__(self, components, endian='|', offset=0, padding=0):
         self._offset = offset
         self._padding = padding
         # a single Components or Atom, representing the struct members.
         self._components = components
-        self._endian = endian
+        self._data_size = components._size
+        self._size = offset + padding + self._data_size
+        # Stored as an index into _ENDIANS, so merging is a table lookup.
+        try:
+            self._endian_i = _ENDIANS.index(endian)
+        except ValueError:
+            raise ValueError(f'invalid endian {endian!r}') from None
+        self._str_cache = None
 
 
     @property
     def data_size(self):
-        return self._components.size
+        return self._data_size
 
 
     @property
     def size(self):
-        return self.offset + self.padding + self.data_size
+        return self._size
 
 
     @property
@@ -172,7 +310,7 @@ class Structure:
 
     @property
     def endian(self):
-        return self._endian
+        return _ENDIANS[self._endian_i]
 
 
     def group(self, name=None):
@@ -188,98 +326,137 @@ class Structure:
 
 
     def __add__(self, other):
-        try:
-            endian = {
-                '>|': '>', '<|': '<',
-                '||': '|', '>>': '>', '<<': '<',
-                '|>': '>', '|<': '<'
-            }[self.endian + other.endian]
-        except KeyError:
-            raise ValueError('endian conflict') from None
-        return Structure(self._components + other._components, endian)
+        merged = _ENDIAN_MERGE[self._endian_i][other._endian_i]
+        if merged is None:
+            raise ValueError('endian conflict')
+        return Structure(
+            self._components + other._components, _ENDIANS[merged]
+        )
+
+
+    @staticmethod
+    def join(structures):
+        # Equivalent to chaining `+`, but builds the result in one step.
+        structures = tuple(structures)
+        merged = 0
+        for s in structures:
+            merged = _ENDIAN_MERGE[merged][s._endian_i]
+            if merged is None:
+                raise ValueError('endian conflict')
+        return Structure(
+            Components.join(s._components for s in structures),
+            _ENDIANS[merged]
+        )
 
 
     def __mul__(self, count):
+        count = _array_count(count)
+        if count is None:
+            return NotImplemented
         return Structure(self._components * count, self.endian)
 
 
     def __str__(self):
-        edesc = {'|': 'unknown', '<': 'little', '>': 'big'}[self.endian]
+        if self._str_cache is None:
+            self._str_cache = self._render()
+        return self._str_cache
+
+
+    def _render(self):
+        edesc = ('unknown', 'little', 'big')[self._endian_i]
         endian = f'{edesc}-endian matcher for'
-        embed_info = f'(offset={self.offset}, padding={self.padding})'
+        embed_info = f'(offset={self._offset}, padding={self._padding})'
         if isinstance(self._components, Atom):
             return f'{endian} {self._components} (atomic) {embed_info}'
-        shape_label = self._components.shapestr
+        shape_label = self._components._shapestr
         field_text = self._components._indented(0, False)
         return f'{endian} structure{shape_label} {embed_info}:\n{field_text}'
 
 
-class Field(Structure, Enum):
-    # size, format code, endian
-    # names alluding to underlying format codes
-    # integers
-    b = ('b', '|')
-    B = ('B', '|')
-    h = ('h', '|')
-    H = ('H', '|')
-    # Normalize to always use the same code internally.
-    i = ('i', '|')
-    I = ('I', '|')
-    l = ('i', '|')
-    L = ('I', '|')
-    q = ('q', '|')
-    Q = ('Q', '|')
-    # booleans
-    _ = ('?', '|')
-    # floats
-    e = ('e', '|')
-    f = ('f', '|')
-    d = ('d', '|')
-    # text
-    x = ('x', '|') # a byte whose value will be discarded.
-    s = ('s', '|') # "arrays" of bytes will become a single `bytes` object.
-    c = ('s', '|') # a single byte, either way.
-    # deliberately not supporting "Pascal strings".
-    # The "native pointer" type also doesn't have a standard size.
-    # names directly indicating type properties
-    # Integers
-    s1 = ('b', '<')
-    S1 = ('b', '>')
-    u1 = ('B', '<')
-    U1 = ('B', '>')
-    s2 = ('h', '<')
-    S2 = ('h', '>')
-    u2 = ('H', '<')
-    U2 = ('H', '>')
-    s4 = ('i', '<')
-    S4 = ('i', '>')
-    u4 = ('I', '<')
-    U4 = ('I', '>')
-    s8 = ('q', '<')
-    S8 = ('q', '>')
-    u8 = ('Q', '<')
-    U8 = ('Q', '>')
-    # For non-numeric types, no endianness applies inherently, but these types
-    # will imply an endianness for the overall struct/array containing them.
-    # booleans
-    b1 = ('?', '<')
-    B1 = ('?', '>')
-    # floats
-    f2 = ('e', '<')
-    F2 = ('e', '>')
-    f4 = ('f', '<')
-    F4 = ('f', '>')
-    f8 = ('d', '<')
-    F8 = ('d', '>')
-    # text
-    p1 = ('x', '<')
-    P1 = ('x', '>')
-    t1 = ('s', '<')
-    T1 = ('s', '>')
+class Field(Structure):
+    __slots__ = ('_name',)
 
 
     def __init__(self, code, endian):
         super().__init__(Atom(code), endian)
-
-
-globals().update(Field.__members__)
+        # Set to the module-level name, for the predefined members.
+        self._name = None
+
+
+    def __reduce__(self):
+        # Members pickle (and copy) by name, so they round-trip to themselves.
+        if self._name is None:
+            return (Field, (self._components._typecode, self.endian))
+        return self._name
+
+
+# names alluding to underlying format codes
+# integers
+b = Field('b', '|')
+B = Field('B', '|')
+h = Field('h', '|')
+H = Field('H', '|')
+# Normalize to always use the same code internally.
+i = Field('i', '|')
+I = Field('I', '|')
+l = i
+L = I
+q = Field('q', '|')
+Q = Field('Q', '|')
+# booleans
+_ = Field('?', '|')
+# floats
+e = Field('e', '|')
+f = Field('f', '|')
+d = Field('d', '|')
+# text
+x = Field('x', '|') # a byte whose value will be discarded.
+s = Field('s', '|') # "arrays" of bytes will become a single `bytes` object.
+c = s # a single byte, either way.
+# deliberately not supporting "Pascal strings".
+# The "native pointer" type also doesn't have a standard size.
+# names directly indicating type properties
+# Integers
+s1 = Field('b', '<')
+S1 = Field('b', '>')
+u1 = Field('B', '<')
+U1 = Field('B', '>')
+s2 = Field('h', '<')
+S2 = Field('h', '>')
+u2 = Field('H', '<')
+U2 = Field('H', '>')
+s4 = Field('i', '<')
+S4 = Field('i', '>')
+u4 = Field('I', '<')
+U4 = Field('I', '>')
+s8 = Field('q', '<')
+S8 = Field('q', '>')
+u8 = Field('Q', '<')
+U8 = Field('Q', '>')
+# For non-numeric types, no endianness applies inherently, but these types
+# will imply an endianness for the overall struct/array containing them.
+# booleans
+b1 = Field('?', '<')
+B1 = Field('?', '>')
+# floats
+f2 = Field('e', '<')
+F2 = Field('e', '>')
+f4 = Field('f', '<')
+F4 = Field('f', '>')
+f8 = Field('d', '<')
+F8 = Field('d', '>')
+# text
+p1 = Field('x', '<')
+P1 = Field('x', '>')
+t1 = Field('s', '<')
+T1 = Field('s', '>')
+
+
+# Make every Field available as a class attribute as well, and record the
+# primary name of each (aliases come after the names they refer to).
+for _name, _value in list(globals().items()):
+    if isinstance(_value, Field):
+        setattr(Field, _name, _value)
+        if _value._name is None:
+            _value._name = _name
+del _name, _value
@@ -1,3 +1,7 @@
+# Standard library.
+import copy
+import pickle
+import weakref
 # System under test.
 import data
 # Third-party.
@@ -81,3 +85,136 @@ def test_good_pairs(first, second):
     assert str(first._components) in lines[1]
     assert lines[2].startswith('1:')
     assert str(second._components) in lines[2]
+
+
+@pytest.mark.parametrize('first', types)
+@pytest.mark.parametrize('second', types)
+def test_join(first, second):
+    """Joining a sequence of matchers is equivalent to adding them."""
+    parts = (first, second * 3, first)
+    if not _compatible_endian(first, second):
+        with pytest.raises(ValueError):
+            data.Structure.join(parts)
+        return
+    matcher = data.Structure.join(parts)
+    expected = first + second * 3 + first
+    assert matcher.endian == expected.endian
+    assert matcher.size == expected.size
+    assert str(matcher) == str(expected)
+
+
+def test_atoms_shared():
+    """Unshaped Atoms with the same typecode are the same object.
+    Shaped Atoms are not interned."""
+    assert data.b._components is data.s1._components
+    assert data.u4._components is data.U4._components
+    count = len(data._ATOMS)
+    assert (data.u4 * 3)._components is not (data.U4 * 3)._components
+    assert len(data._ATOMS) == count
+
+
+@pytest.mark.parametrize('value', (
+    data.u4, data.u4 + data.u4, data.u4 * 3, (data.u4 + data.f8) * 2
+))
+def test_copy_round_trip(value):
+    """Matchers survive copying and pickling, and Atoms stay shared."""
+    for result in (
+        copy.copy(value), copy.deepcopy(value),
+        pickle.loads(pickle.dumps(value))
+    ):
+        assert type(result) is type(value)
+        assert result.size == value.size
+        assert str(result) == str(value)
+
+
+def test_atom_copies_shared():
+    """Copying or unpickling an Atom gives back the interned instance."""
+    atom = data.u4._components
+    shaped = (data.u4 * 3)._components
+    assert str(pickle.loads(pickle.dumps(shaped))) == str(shaped)
+    assert copy.copy(atom) is atom
+    assert copy.deepcopy(atom) is atom
+    assert pickle.loads(pickle.dumps(atom)) is atom
+
+
+def test_atom_unpickle_keeps_caches():
+    """Unpickling an interned Atom doesn't overwrite its cached values."""
+    atom = data.u4._components
+    normalized, text = atom._normalize(), str(atom)
+    assert pickle.loads(pickle.dumps(atom)) is atom
+    assert atom._normalized is normalized
+    assert atom._str_cache is text
+
+
+@pytest.mark.parametrize('value', types)
+def test_bad_counts(value):
+    """Only non-negative integer array counts are accepted."""
+    with pytest.raises(TypeError):
+        value * 2.0
+    with pytest.raises(TypeError):
+        value * '2'
+    with pytest.raises(ValueError):
+        value * -1
+    with pytest.raises(TypeError):
+        value._components * 2.0
+    with pytest.raises(ValueError):
+        value._components * -1
+
+
+def test_aliases():
+    """Alternate names refer to the same Field."""
+    assert data.l is data.i
+    assert data.L is data.I
+    assert data.c is data.s
+
+
+@pytest.mark.parametrize('value', types)
+def test_field_round_trip(value):
+    """Predefined Fields copy and unpickle to themselves."""
+    assert copy.copy(value) is value
+    assert copy.deepcopy(value) is value
+    assert pickle.loads(pickle.dumps(value)) is value
+
+
+class _Index:
+    def __init__(self, value):
+        self._value = value
+
+
+    def __index__(self):
+        return self._value
+
+
+@pytest.mark.parametrize('value', types)
+def test_integer_like_counts(value):
+    """Array counts are normalized to plain ints."""
+    assert (value * True)._components.shape == (1,)
+    assert type((value * True)._components.shape[0]) is int
+    assert (value * _Index(3))._components.shape == (3,)
+    assert (value * _Index(3)).size == value.size * 3
+
+
+@pytest.mark.parametrize(
+    'attribute', ('offset', 'padding', 'endian', 'size', 'data_size')
+)
+def test_read_only(attribute):
+    """Shared matchers and their components can't be modified."""
+    with pytest.raises(AttributeError):
+        setattr(data.u4, attribute, getattr(data.u4, attribute))
+    with pytest.raises(AttributeError):
+        data.u4._components.size = 8
+
+
+def test_weak_references():
+    """Matchers and their components support weak references."""
+    assert weakref.ref(data.u4)() is data.u4
+    assert weakref.ref(data.u4._components)() is data.u4._components
+    matcher = data.u4 + data.u4
+    assert weakref.ref(matcher._components)() is matcher._components
+
+
+@pytest.mark.parametrize('endian', ('', '=', '<>', None))
+def test_bad_endian(endian):
+    """An unrecognized endian marker is rejected with a clear message."""
+    with pytest.raises(ValueError, match='invalid endian'):
+        data.Structure(data.u4._components, endian)